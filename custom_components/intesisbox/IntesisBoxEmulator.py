@@ -1,6 +1,13 @@
 """Emulates an IntesisBox device on TCP port 3310."""
 
 import asyncio
+import re
+import socket
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 MODE_AUTO = "AUTO"
 MODE_DRY = "DRY"
@@ -17,6 +24,10 @@ FUNCTION_AMBTEMP = "AMBTEMP"
 FUNCTION_ERRSTATUS = "ERRSTATUS"
 FUNCTION_ERRCODE = "ERRCODE"
 
+# Requests are terminated by CR, LF or both; match the text between them,
+# stopping at the last non-blank character so no trailing strip is needed.
+_LINE = re.compile(rb"[^\r\n]*[^\s]")
+
 RW_FUNCTIONS = [
     FUNCTION_ONOFF,
     FUNCTION_MODE,
@@ -27,6 +38,19 @@ RW_FUNCTIONS = [
 ]
 
 
+_ERR = b"ERR\r\n"
+_ID_RESPONSE = b"ID:IS-IR-WMP-1,001DC9A2C911,192.168.100.246,ASCII,v0.0.1,-44\r\n"
+_ACK_CHN = b"ACK\r\nCHN,"
+
+_LIMITS_RESPONSES = {
+    b"FANSP": b"LIMITS:FANSP,[AUTO,1,2,3,4]\r\n",
+    b"VANEUD": b"LIMITS:VANEUD,[AUTO,1,2,3,SWING]\r\n",
+    b"VANELR": b"LIMITS:VANELR,[AUTO,1,2,3,SWING]\r\n",
+    b"SETPTEMP": b"LIMITS:SETPTEMP,[160,300]\r\n",
+    b"MODE": b"LIMITS:MODE,[AUTO,HEAT,DRY,COOL,FAN]\r\n",
+}
+
+
 class IntesisBoxEmulator(asyncio.Protocol):
     """Dummy device, for testing."""
 
@@ -48,6 +72,19 @@ class IntesisBoxEmulator(asyncio.Protocol):
                 FUNCTION_ERRCODE: "",
             }
         }
+        self._dump_cache: dict[str, bytes] = {}
+        self._rxbuf = bytearray()
+
+    def _encoded_dump(self, acNum: str) -> bytes:
+        """Return every function of a unit as CHN lines, cached until a SET."""
+        dump = self._dump_cache.get(acNum)
+        if dump is None:
+            dump = b"".join(
+                f"CHN,{acNum}:{function},{value}\r\n".encode("ascii")
+                for function, value in self.devices[acNum].items()
+            )
+            self._dump_cache[acNum] = dump
+        return dump
 
     def connection_made(self, transport):
         """Store connection when setup."""
@@ -55,65 +92,86 @@ class IntesisBoxEmulator(asyncio.Protocol):
 
     def data_received(self, data):
         """Process received data."""
-        linesReceived = data.decode("ascii").splitlines()
-        for line in linesReceived:
-            request = line.rstrip().split(",")
-            response = ""
-            if request[0] == "ID":
-                response = (
-                    "ID:IS-IR-WMP-1,001DC9A2C911,192.168.100.246,ASCII,v0.0.1,-44"
-                )
-            elif request[0] == "GET":
-                acNum = request[1].split(":")[0]
-                function = request[1].split(":")[1]
-                if acNum in self.devices and function == "*":
-                    for function, value in self.devices[acNum].items():
-                        response += f"CHN,{acNum}:{function},{value}\r\n"
-                elif acNum in self.devices and function in self.devices[acNum]:
-                    current_value = self.devices[acNum][function]
-                    response = f"CHN,{acNum}:{function},{current_value}"
-                else:
-                    response = "ERR"
-
-            elif request[0] == "SET":
-                acNum = request[1].split(":")[0]
-                function = request[1].split(":")[1]
-                if (
-                    acNum in self.devices
-                    and function in RW_FUNCTIONS
-                    and len(request) >= 3
-                ):
-                    value = request[2]
-                    if self.devices[acNum][function] != value:
-                        self.devices[acNum][function] = value
-                        response = f"ACK\r\nCHN,{acNum}:{function},{value}"
+        # TCP may split a request across chunks; keep any unterminated tail
+        buf = self._rxbuf
+        buf += data
+        last = max(buf.rfind(b"\r"), buf.rfind(b"\n"))
+        if last == -1:
+            return
+
+        out = bytearray()
+        # Work on offsets into one view of the buffer so parsing copies nothing
+        with memoryview(buf) as view:
+            for match in _LINE.finditer(buf, 0, last):
+                start, end = match.span()
+                comma = buf.find(b",", start, end)
+                verb = view[start : end if comma == -1 else comma]
+                if verb == b"ID":
+                    out += _ID_RESPONSE
+                elif verb == b"GET":
+                    colon = buf.find(b":", comma, end)
+                    if colon == -1:
+                        out += _ERR
+                        continue
+                    acNum = str(view[comma + 1 : colon], "ascii")
+                    function = str(view[colon + 1 : end], "ascii")
+                    if acNum in self.devices and function == "*":
+                        out += self._encoded_dump(acNum)
+                    elif acNum in self.devices and function in self.devices[acNum]:
+                        current_value = self.devices[acNum][function]
+                        out += f"CHN,{acNum}:{function},{current_value}\r\n".encode(
+                            "ascii"
+                        )
+                    else:
+                        out += _ERR
+
+                elif verb == b"SET":
+                    colon = buf.find(b":", comma, end)
+                    sep = buf.find(b",", colon, end)
+                    if colon == -1 or sep == -1:
+                        out += _ERR
+                        continue
+                    acNum = str(view[comma + 1 : colon], "ascii")
+                    function = str(view[colon + 1 : sep], "ascii")
+                    if acNum in self.devices and function in RW_FUNCTIONS:
+                        value = str(view[sep + 1 : end], "ascii")
+                        if self.devices[acNum][function] != value:
+                            self.devices[acNum][function] = value
+                            self._dump_cache.pop(acNum, None)
+                            # Echo the unit/function/value bytes as received
+                            out += _ACK_CHN
+                            out += view[comma + 1 : end]
+                            out += b"\r\n"
+                        else:
+                            out += b"ACK\r\n"
                     else:
-                        response = "ACK"
+                        out += _ERR
+
+                elif verb[:7] == b"LIMITS:":
+                    out += _LIMITS_RESPONSES.get(bytes(verb[7:]), _ERR)
+
                 else:
-                    response = "ERR"
+                    out += _ERR
 
-            elif request[0].split(":")[0] == "LIMITS":
-                limit = request[0].split(":")[1]
-                if limit == "FANSP":
-                    response = "LIMITS:FANSP,[AUTO,1,2,3,4]"
-                elif limit == "VANEUD":
-                    response = "LIMITS:VANEUD,[AUTO,1,2,3,SWING]"
-                elif limit == "VANELR":
-                    response = "LIMITS:VANELR,[AUTO,1,2,3,SWING]"
-                elif limit == "SETPTEMP":
-                    response = "LIMITS:SETPTEMP,[160,300]"
-                elif limit == "MODE":
-                    response = "LIMITS:MODE,[AUTO,HEAT,DRY,COOL,FAN]"
+        # Rebind rather than resize: the parsed buffer may still be exported
+        self._rxbuf = buf[last + 1 :]
 
-            response += "\r\n"
-            self.transport.write(response.encode("ascii"))
+        if out:
+            self.transport.write(bytes(out))
 
 
 async def main(host, port):
     """Set up and run the emulator."""
     loop = asyncio.get_running_loop()
-    server = await loop.create_server(IntesisBoxEmulator, host, port)
+    # SO_REUSEPORT lets several emulator processes share the port under load
+    server = await loop.create_server(
+        IntesisBoxEmulator, host, port, reuse_port=hasattr(socket, "SO_REUSEPORT")
+    )
     await server.serve_forever()
 
 
-asyncio.run(main("0.0.0.0", 3310))
+if __name__ == "__main__":
+    with asyncio.Runner(
+        loop_factory=uvloop.new_event_loop if uvloop else None
+    ) as runner:
+        runner.run(main("0.0.0.0", 3310))
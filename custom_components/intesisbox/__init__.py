@@ -5,23 +5,61 @@ import asyncio
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
 
 DOMAIN = "intesisbox"
 PLATFORMS = ["climate"]
+CONNECT_TIMEOUT = 10
+# hass.data[DOMAIN] key for the controllers shared between setups, by host
+CONTROLLERS = "controllers"
+
+
+async def async_acquire_controller(hass: HomeAssistant, host: str):
+    """Return a connected controller for host, reusing one that is already open.
+
+    Each successful call must be paired with async_release_controller().
+    Raises asyncio.TimeoutError if the device does not answer in time.
+    """
+    from . import intesisbox
+
+    pool = hass.data.setdefault(DOMAIN, {}).setdefault(CONTROLLERS, {})
+    if host in pool:
+        pool[host][1] += 1
+        controller = pool[host][0]
+    else:
+        controller = intesisbox.IntesisBox(host, loop=hass.loop)
+        pool[host] = [controller, 1]
+        controller.connect()
+
+    try:
+        await asyncio.wait_for(controller.connected_event.wait(), CONNECT_TIMEOUT)
+    except asyncio.TimeoutError:
+        async_release_controller(hass, host)
+        raise
+    return controller
+
+
+def async_release_controller(hass: HomeAssistant, host: str) -> None:
+    """Drop one reference to a shared controller, stopping it at zero."""
+    pool = hass.data[DOMAIN][CONTROLLERS]
+    entry = pool.get(host)
+    if entry is None:
+        return
+    entry[1] -= 1
+    if entry[1] <= 0:
+        del pool[host]
+        entry[0].stop()
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Load the saved entities."""
     host = entry.data[CONF_HOST]
 
-    from . import intesisbox
-
-    controller = intesisbox.IntesisBox(host, loop=hass.loop)
-    controller.connect()
-    while not controller.is_connected:
-        await asyncio.sleep(0.1)
+    try:
+        controller = await async_acquire_controller(hass, host)
+    except asyncio.TimeoutError as ex:
+        raise ConfigEntryNotReady(f"Timed out connecting to {host}") from ex
 
-    hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = controller
 
     if entry.unique_id is None:
@@ -29,13 +67,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             entry, unique_id=controller.device_mac_address
         )
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        # async_unload_entry is not called for a failed setup
+        hass.data[DOMAIN].pop(entry.entry_id)
+        async_release_controller(hass, host)
+        raise
 
     return True
 
 
 async def async_unload_entry(hass, entry):
     """Unload a config entry."""
-    controller = hass.data[DOMAIN][entry.entry_id]
-    controller.stop()
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        hass.data[DOMAIN].pop(entry.entry_id)
+        async_release_controller(hass, entry.data[CONF_HOST])
+    return unload_ok
@@ -5,7 +5,7 @@ https://github.com/jnimmo/hass-intesisbox
 """
 
 import asyncio
-from datetime import timedelta
+from functools import partial
 import logging
 
 import voluptuous as vol
@@ -22,19 +22,23 @@ from homeassistant.const import (
     CONF_HOST,
     CONF_NAME,
     CONF_UNIQUE_ID,
-    STATE_UNKNOWN,
     UnitOfTemperature,
 )
+from homeassistant.core import callback
 from homeassistant.exceptions import PlatformNotReady
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.debounce import Debouncer
 
-from . import DOMAIN
+from . import DOMAIN, async_acquire_controller, async_release_controller
 from .intesisbox import IntesisBox
 
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_NAME = "Intesisbox"
 
+# Seconds to gather further controller pushes before writing state again
+UPDATE_COOLDOWN = 0.1
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Required(CONF_HOST): cv.string,
@@ -43,11 +47,6 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     }
 )
 
-# Return cached results if last scan time was less than this value.
-# If a persistent connection is established for the controller, changes to
-# values are in realtime.
-SCAN_INTERVAL = timedelta(seconds=300)
-
 MAP_OPERATION_MODE_TO_HA = {
     "AUTO": HVACMode.HEAT_COOL,
     "FAN": HVACMode.FAN_ONLY,
@@ -56,8 +55,6 @@ MAP_OPERATION_MODE_TO_HA = {
     "COOL": HVACMode.COOL,
     "OFF": HVACMode.OFF,
 }
-MAP_OPERATION_MODE_TO_IB = {v: k for k, v in MAP_OPERATION_MODE_TO_HA.items()}
-
 MAP_STATE_ICONS = {
     HVACMode.HEAT: "mdi:white-balance-sunny",
     HVACMode.HEAT_COOL: "mdi:cached",
@@ -66,6 +63,12 @@ MAP_STATE_ICONS = {
     HVACMode.FAN_ONLY: "mdi:fan",
 }
 
+# HA mode -> (IntesisBox mode, icon), so each lookup is a single dict access
+MAP_HA_MODE_TO_IB_AND_ICON = {
+    ha_mode: (ib_mode, MAP_STATE_ICONS.get(ha_mode))
+    for ib_mode, ha_mode in MAP_OPERATION_MODE_TO_HA.items()
+}
+
 FAN_MODE_I_TO_E = {
     "AUTO": "auto",
     "1": "low",
@@ -81,19 +84,55 @@ SWING_LIST_VERTICAL = "Vertical"
 SWING_LIST_BOTH = "Both"
 SWING_LIST_STOP = "Auto"
 
+# HA swing mode -> (vertical vane, horizontal vane)
+SWING_MODE_TO_VANES = {
+    SWING_LIST_BOTH: (SWING_ON, SWING_ON),
+    SWING_LIST_STOP: (SWING_STOP, SWING_STOP),
+    SWING_LIST_HORIZONTAL: (SWING_STOP, SWING_ON),
+    SWING_LIST_VERTICAL: (SWING_ON, SWING_STOP),
+}
+
+# Swing modes offered, keyed by (horizontal vane swings, vertical vane swings)
+SWING_LISTS = {
+    (False, False): (SWING_LIST_STOP,),
+    (True, False): (SWING_LIST_STOP, SWING_LIST_HORIZONTAL),
+    (False, True): (SWING_LIST_STOP, SWING_LIST_VERTICAL),
+    (True, True): (
+        SWING_LIST_STOP,
+        SWING_LIST_HORIZONTAL,
+        SWING_LIST_VERTICAL,
+        SWING_LIST_BOTH,
+    ),
+}
+
+# Indexed by (vertical swinging << 1) | horizontal swinging
+SWING_MODE_BY_VANES = (
+    SWING_LIST_STOP,
+    SWING_LIST_HORIZONTAL,
+    SWING_LIST_VERTICAL,
+    SWING_LIST_BOTH,
+)
+
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Create the Intesisbox climate devices."""
-    from . import intesisbox
-
-    controller = intesisbox.IntesisBox(config[CONF_HOST], loop=hass.loop)
-    controller.connect()
-    while not controller.is_connected:
-        await asyncio.sleep(0.1)
+    host = config[CONF_HOST]
+    try:
+        controller = await async_acquire_controller(hass, host)
+    except asyncio.TimeoutError as ex:
+        raise PlatformNotReady(f"Timed out connecting to {host}") from ex
 
     name = config.get(CONF_NAME)
     unique_id = config.get(CONF_UNIQUE_ID)
-    async_add_entities([IntesisBoxAC(controller, name, unique_id)], True)
+    try:
+        entity = IntesisBoxAC(controller, name, unique_id)
+    except PlatformNotReady:
+        async_release_controller(hass, host)
+        raise
+
+    # The entity holds this platform's reference to the shared controller
+    entity.async_on_remove(partial(async_release_controller, hass, host))
+    async_add_entities([entity], True)
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
@@ -105,6 +144,28 @@ async def async_setup_entry(hass, entry, async_add_entities):
 class IntesisBoxAC(ClimateEntity):
     """Represents an Intesisbox air conditioning device."""
 
+    # Entity itself has no __slots__, so HA's own attributes (including the
+    # _attr_* state below) still live in __dict__.
+    __slots__ = (
+        "_connected",
+        "_connection_retries",
+        "_controller",
+        "_current_operation",
+        "_debouncer",
+        "_deviceid",
+        "_fan_i2e",
+        "_has_swing_control",
+        "_hswing",
+        "_last_ib_fan",
+        "_last_ib_mode",
+        "_last_seen_version",
+        "_op_to_ha",
+        "_power",
+        "_rssi",
+        "_supported_ha_modes",
+        "_vswing",
+    )
+
     def __init__(
         self,
         controller: IntesisBox,
@@ -114,187 +175,194 @@ class IntesisBoxAC(ClimateEntity):
         """Initialize the thermostat."""
         _LOGGER.debug("Setting up climate device.")
         self._controller = controller
+        # Bound lookups used on every update
+        self._op_to_ha = MAP_OPERATION_MODE_TO_HA.get
+        self._fan_i2e = FAN_MODE_I_TO_E.get
 
         self._deviceid = controller.device_mac_address
-        self._devicename = name or controller.device_mac_address
-        self._unique_id = unique_id or controller.device_mac_address
+        self._attr_name = name or controller.device_mac_address
+        self._attr_unique_id = unique_id or controller.device_mac_address
+        self._attr_temperature_unit = UnitOfTemperature.CELSIUS
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, self._attr_unique_id)},
+            "name": self._attr_name,
+            "manufacturer": "Intesis",
+            "model": controller.device_model,
+            "sw_version": controller.firmware_version,
+        }
+        self._attr_should_poll = False
         self._connected = controller.is_connected
         # Disable compatibility mode until 2025.1 as per https://developers.home-assistant.io/blog/2024/01/24/climate-climateentityfeatures-expanded/
         self._enable_turn_on_off_backwards_compatibility = False
 
-        self._max_temp = controller.max_setpoint
-        self._min_temp = controller.min_setpoint
-        self._target_temperature = None
-        self._current_temp = None
+        # State HA reads on every write, kept in _attr_* fields and refreshed
+        # only when the controller reports a change
+        self._attr_max_temp = controller.max_setpoint
+        self._attr_min_temp = controller.min_setpoint
+        self._attr_target_temperature = None
+        self._attr_current_temperature = None
+        self._attr_fan_mode = None
+        self._attr_swing_mode = SWING_LIST_STOP
+        self._attr_hvac_mode = HVACMode.OFF
+        self._attr_icon = None
+        self._attr_assumed_state = not self._connected
+        self._attr_available = True
+        self._attr_extra_state_attributes = {}
         self._rssi = None
-        self._swing_list = []
         self._vswing = False
         self._hswing = False
         self._power = False
-        self._current_operation = STATE_UNKNOWN
+        self._current_operation = HVACMode.OFF
+        self._last_ib_fan = None
+        self._last_ib_mode = None
         self._connection_retries = 0
+        self._last_seen_version = -1
+        self._debouncer: Debouncer | None = None
         self._has_swing_control = self._controller.has_swing_control
 
         # Setup fan list
-        self._fan_list = [x.title() for x in self._controller.fan_speed_list]
-        if len(self._fan_list) < 1:
+        fan_list = self._controller.fan_speed_list_title
+        if len(fan_list) < 1:
             raise PlatformNotReady("Controller hasn't finished initializing device")
-        self._fan_speed = None
+        self._attr_fan_modes = [self._fan_i2e(mode.upper(), mode) for mode in fan_list]
 
         # Setup operation list
-        self._operation_list = [HVACMode.OFF]
-        for operation in self._controller.operation_list:
-            self._operation_list.append(MAP_OPERATION_MODE_TO_HA[operation])
-        if len(self._operation_list) == 1:
+        operation_list = [
+            HVACMode.OFF,
+            *(MAP_OPERATION_MODE_TO_HA[op] for op in self._controller.operation_list),
+        ]
+        if len(operation_list) == 1:
             raise PlatformNotReady
+        self._supported_ha_modes = frozenset(operation_list)
+        self._attr_hvac_modes = operation_list
 
         # Setup feature support
-        self._base_features = ClimateEntityFeature.TARGET_TEMPERATURE
+        features = ClimateEntityFeature.TARGET_TEMPERATURE
 
-        self._base_features |= ClimateEntityFeature.TURN_ON
-        self._base_features |= ClimateEntityFeature.TURN_OFF
+        features |= ClimateEntityFeature.TURN_ON
+        features |= ClimateEntityFeature.TURN_OFF
 
-        if len(self._fan_list) > 0:
-            self._base_features |= ClimateEntityFeature.FAN_MODE
+        if len(fan_list) > 0:
+            features |= ClimateEntityFeature.FAN_MODE
 
         # Setup swing control
         if self._has_swing_control:
-            self._base_features |= ClimateEntityFeature.SWING_MODE
-            self._swing_list = [SWING_LIST_STOP]
-            if SWING_ON in self._controller.vane_horizontal_list:
-                self._swing_list.append(SWING_LIST_HORIZONTAL)
-            if SWING_ON in self._controller.vane_vertical_list:
-                self._swing_list.append(SWING_LIST_VERTICAL)
-            if len(self._swing_list) > 2:
-                self._swing_list.append(SWING_LIST_BOTH)
+            features |= ClimateEntityFeature.SWING_MODE
+            self._attr_swing_modes = list(
+                SWING_LISTS[
+                    SWING_ON in self._controller.vane_horizontal_set,
+                    SWING_ON in self._controller.vane_vertical_set,
+                ]
+            )
+
+        self._attr_supported_features = features
 
         _LOGGER.debug("Finished setting up climate entity!")
         self._controller.add_update_callback(self.update_callback)
 
-    @property
-    def name(self):
-        """Return the name of the AC device."""
-        return self._devicename
-
-    @property
-    def unique_id(self):
-        """Return the unique id of the AC device."""
-        return self._unique_id
-
-    @property
-    def temperature_unit(self):
-        """Intesisbox API uses celsius on the backend."""
-        return UnitOfTemperature.CELSIUS
-
-    @property
-    def device_info(self):
-        """Info about the IntesisBox itself."""
-        return {
-            "identifiers": {(DOMAIN, self.unique_id)},
-            "name": self.name,
-            "manufacturer": "Intesis",
-            "model": self._controller.device_model,
-            "sw_version": self._controller.firmware_version,
-        }
-
-    @property
-    def extra_state_attributes(self):
-        """Return the device specific state attributes."""
-        attrs = {}
-        if self._has_swing_control:
-            attrs["vertical_swing"] = self._vswing
-            attrs["horizontal_swing"] = self._hswing
-
-        if self._controller.is_connected:
-            attrs["ha_update_type"] = "push"
-        else:
-            attrs["ha_update_type"] = "poll"
-
-        return attrs
-
-    def set_temperature(self, **kwargs):
+    async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
-        _LOGGER.debug(f"set_temperature({kwargs!r})")
+        _LOGGER.debug("async_set_temperature(%r)", kwargs)
 
         temperature = kwargs.get(ATTR_TEMPERATURE)
         operation_mode = kwargs.get(ATTR_HVAC_MODE)
 
+        if operation_mode and operation_mode != HVACMode.OFF:
+            # The new setpoint goes out in the same write as the mode change
+            self._set_hvac_mode(operation_mode, temperature)
+            return
+
         if operation_mode:
-            self.set_hvac_mode(operation_mode)
+            self._set_hvac_mode(operation_mode)
 
         if temperature:
             self._controller.set_temperature(temperature)
 
-    def set_hvac_mode(self, operation_mode):
+    async def async_set_hvac_mode(self, operation_mode):
         """Set operation mode."""
-        _LOGGER.debug(f"set_hvac_mode({operation_mode=})")
+        _LOGGER.debug("async_set_hvac_mode(operation_mode=%r)", operation_mode)
+        self._set_hvac_mode(operation_mode)
+
+    def _set_hvac_mode(self, operation_mode, temperature=None):
+        """Set operation mode, sending a new setpoint along with it if given."""
+        if operation_mode not in self._supported_ha_modes:
+            _LOGGER.warning("Unsupported HVAC mode %s", operation_mode)
+            return
+
         if operation_mode == HVACMode.OFF:
             self._controller.set_power_off()
             self._power = False
+            self._update_derived_state()
         else:
-            self._controller.set_mode(MAP_OPERATION_MODE_TO_IB[operation_mode])
+            ib_mode, _ = MAP_HA_MODE_TO_IB_AND_ICON[operation_mode]
 
             # Send the temperature again in case changing modes has changed it
-            if self._target_temperature:
-                self._controller.set_temperature(self._target_temperature)
+            if temperature is None and ib_mode != self._controller.mode:
+                temperature = self._attr_target_temperature
+            self._controller.set_mode(ib_mode, temperature)
 
-        self.hass.async_add_job(self.schedule_update_ha_state, False)
+        self.async_write_ha_state()
 
-    def turn_on(self):
+    async def async_turn_on(self):
         """Turn thermostat on."""
         self._controller.set_power_on()
-        self.hass.async_add_job(self.schedule_update_ha_state, False)
+        self._power = True
+        self._update_derived_state()
+        self.async_write_ha_state()
 
-    def turn_off(self):
+    async def async_turn_off(self):
         """Turn thermostat off."""
-        self.set_hvac_mode(HVACMode.OFF)
+        await self.async_set_hvac_mode(HVACMode.OFF)
 
-    def set_fan_mode(self, fan_mode):
+    async def async_set_fan_mode(self, fan_mode):
         """Set fan mode (from quiet, low, medium, high, auto)."""
-        target = FAN_MODE_E_TO_I.get(fan_mode, fan_mode)
+        target = FAN_MODE_E_TO_I.get(fan_mode, fan_mode).upper()
         _LOGGER.debug(
-            f"set_fan_mode({fan_mode=}) -> set_fan_speed(target={target.upper()})"
+            "async_set_fan_mode(fan_mode=%r) -> set_fan_speed(target=%s)",
+            fan_mode,
+            target,
         )
-        self._controller.set_fan_speed(target.upper())
+        self._controller.set_fan_speed(target)
 
-    def set_swing_mode(self, swing_mode):
+    async def async_set_swing_mode(self, swing_mode):
         """Set the vertical vane."""
-        if swing_mode == SWING_LIST_BOTH:
-            self._controller.set_vertical_vane(SWING_ON)
-            self._controller.set_horizontal_vane(SWING_ON)
-        elif swing_mode == SWING_LIST_STOP:
-            self._controller.set_vertical_vane(SWING_STOP)
-            self._controller.set_horizontal_vane(SWING_STOP)
-        elif swing_mode == SWING_LIST_HORIZONTAL:
-            self._controller.set_vertical_vane(SWING_STOP)
-            self._controller.set_horizontal_vane(SWING_ON)
-        elif swing_mode == SWING_LIST_VERTICAL:
-            self._controller.set_vertical_vane(SWING_ON)
-            self._controller.set_horizontal_vane(SWING_STOP)
+        vanes = SWING_MODE_TO_VANES.get(swing_mode)
+        if vanes:
+            self._controller.set_vanes(*vanes)
 
     async def async_update(self):
         """Copy values from controller dictionary to climate device."""
-        if not self._controller.is_connected:
-            await asyncio.sleep(
-                60
-            )  # per device specs, wait min 1 sec before re-connecting
-            await self.hass.async_add_executor_job(self._controller.connect)
-            self._connection_retries += 1
-        else:
-            self._connection_retries = 0
+        self._update_from_controller()
 
-        self._power = self._controller.is_on
-        self._current_temp = self._controller.ambient_temperature
-        self._min_temp = self._controller.min_setpoint
-        self._max_temp = self._controller.max_setpoint
-        self._target_temperature = self._controller.setpoint
+    def _update_from_controller(self) -> bool:
+        """Copy controller state into the entity, returning False if unchanged."""
+        version = self._controller.state_version
+        if version == self._last_seen_version:
+            return False
+        self._last_seen_version = version
 
-        if self._controller.fan_speed:
-            self._fan_speed = self._controller.fan_speed.title()
+        connected = self._controller.is_connected
+        self._connection_retries = self._controller.connection_retries
+
+        self._power = self._controller.is_on
+        self._attr_current_temperature = self._controller.ambient_temperature
+        self._attr_min_temp = self._controller.min_setpoint
+        self._attr_max_temp = self._controller.max_setpoint
+        self._attr_target_temperature = self._controller.setpoint
+
+        # Only re-derive the fan speed and mode when the raw values change
+        ib_fan = self._controller.fan_speed
+        if ib_fan and ib_fan != self._last_ib_fan:
+            self._last_ib_fan = ib_fan
+            # The mapped names are already lower case, so only unmapped
+            # speeds need a new string
+            self._attr_fan_mode = self._fan_i2e(ib_fan) or ib_fan.lower()
 
         # Operation mode
         ib_mode = self._controller.mode
-        self._current_operation = MAP_OPERATION_MODE_TO_HA.get(ib_mode, STATE_UNKNOWN)
+        if ib_mode != self._last_ib_mode:
+            self._last_ib_mode = ib_mode
+            self._current_operation = self._op_to_ha(ib_mode, HVACMode.OFF)
 
         # Swing mode
         # Climate module only supports one swing setting.
@@ -303,113 +371,76 @@ class IntesisBoxAC(ClimateEntity):
             self._hswing = self._controller.horizontal_swing == SWING_ON
 
         # Track connection lost/restored.
-        if self._connected != self._controller.is_connected:
-            self._connected = self._controller.is_connected
-            if self._connected:
+        if self._connected != connected:
+            self._connected = connected
+            if connected:
                 _LOGGER.debug("Connection to Intesisbox was restored.")
             else:
                 _LOGGER.debug("Lost connection to Intesisbox.")
 
-    async def async_will_remove_from_hass(self):
-        """Shutdown the controller when the device is being removed."""
-        self._controller.stop()
-
-    @property
-    def icon(self):
-        """Return the icon for the current state."""
-        icon = None
-        if self._power:
-            icon = MAP_STATE_ICONS.get(self._current_operation)
-        return icon
-
-    def update_callback(self):
-        """Let HA know there has been an update from the controller."""
-        _LOGGER.debug("Intesisbox sent a status update.")
-        if self.hass:
-            self.hass.async_add_job(self.schedule_update_ha_state, True)
-
-    @property
-    def min_temp(self):
-        """Return the minimum temperature for the current mode of operation."""
-        return self._min_temp
-
-    @property
-    def max_temp(self):
-        """Return the maximum temperature for the current mode of operation."""
-        return self._max_temp
-
-    @property
-    def is_on(self):
-        """Return true if on."""
-        return self._power
-
-    @property
-    def should_poll(self):
-        """Poll for updates if pyIntesisbox doesn't have a socket open."""
-        # This could be switched on controller.is_connected, but HA doesn't
-        # seem to handle dynamically changing from push to poll.
+        self._update_derived_state()
         return True
 
-    @property
-    def hvac_modes(self):
-        """List of available operation modes."""
-        return self._operation_list
+    def _update_derived_state(self):
+        """Work out the values HA reads repeatedly once per state change."""
+        self._attr_swing_mode = SWING_MODE_BY_VANES[self._vswing << 1 | self._hswing]
 
-    @property
-    def fan_mode(self):
-        """Return whether the fan is on."""
-        return FAN_MODE_I_TO_E.get(self._fan_speed, self._fan_speed).lower()
-
-    @property
-    def swing_mode(self):
-        """Return current swing mode."""
-        if self._vswing and self._hswing:
-            return SWING_LIST_BOTH
-        elif self._vswing:
-            return SWING_LIST_VERTICAL
-        elif self._hswing:
-            return SWING_LIST_HORIZONTAL
+        if self._power:
+            self._attr_hvac_mode = self._current_operation
+            _, self._attr_icon = MAP_HA_MODE_TO_IB_AND_ICON[self._current_operation]
         else:
-            return SWING_LIST_STOP
-
-    @property
-    def fan_modes(self):
-        """List of available fan modes."""
-        return [FAN_MODE_I_TO_E.get(mode.upper(), mode) for mode in self._fan_list]
+            self._attr_hvac_mode = HVACMode.OFF
+            self._attr_icon = None
 
-    @property
-    def swing_modes(self):
-        """List of available swing positions."""
-        return self._swing_list
-
-    @property
-    def assumed_state(self) -> bool:
-        """If the device is not connected we have to assume state."""
-        return not self._connected
+        # If the device is not connected we have to assume state, and once it
+        # hasn't been able to reconnect it is marked unavailable
+        self._attr_assumed_state = not self._connected
+        self._attr_available = self._connected or self._connection_retries < 2
 
-    @property
-    def available(self) -> bool:
-        """If the device hasn't been able to connect, mark as unavailable."""
-        return self._connected or self._connection_retries < 2
+        # Update the one attributes dict in place; HA copies it on each write
+        attrs = self._attr_extra_state_attributes
+        if self._has_swing_control:
+            attrs["vertical_swing"] = self._vswing
+            attrs["horizontal_swing"] = self._hswing
+        attrs["ha_update_type"] = "push" if self._connected else "poll"
+
+    async def async_added_to_hass(self):
+        """Start coalescing controller pushes once the entity is registered."""
+        self._debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=UPDATE_COOLDOWN,
+            immediate=True,
+            function=self._async_flush_update,
+        )
 
-    @property
-    def current_temperature(self):
-        """Return the current temperature."""
-        return self._current_temp
+    async def async_will_remove_from_hass(self):
+        """Stop listening to the controller when the device is being removed.
 
-    @property
-    def hvac_mode(self):
-        """Return the current mode of operation if unit is on."""
-        if self._power:
-            return self._current_operation
-        return HVACMode.OFF
+        The controller may be shared, so whoever acquired it releases it.
+        """
+        self._controller.remove_update_callback(self.update_callback)
+        if self._debouncer:
+            self._debouncer.async_cancel()
 
-    @property
-    def target_temperature(self):
-        """Return the current setpoint temperature if unit is on."""
-        return self._target_temperature
+    @callback
+    def update_callback(self):
+        """Let HA know there has been an update from the controller."""
+        # Runs for every controller push, so skip building the record entirely
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Intesisbox sent a status update.")
+        # Bursts of pushes within the cooldown collapse into one state write
+        if self._debouncer:
+            self._debouncer.async_schedule_call()
+
+    @callback
+    def _async_flush_update(self):
+        """Refresh HA state once for all controller pushes since the last flush."""
+        # The controller pushes in realtime, so write its state straight away
+        if self._update_from_controller():
+            self.async_write_ha_state()
 
     @property
-    def supported_features(self):
-        """Return the list of supported features."""
-        return self._base_features
+    def is_on(self):
+        """Return true if on."""
+        return self._power
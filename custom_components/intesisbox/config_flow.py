@@ -1,5 +1,6 @@
 """Config flow to configure the Intesisbox integration."""
 
+import asyncio
 import logging
 
 import voluptuous as vol
@@ -7,7 +8,7 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST
 
-from . import DOMAIN
+from . import DOMAIN, async_acquire_controller, async_release_controller
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,10 +46,20 @@ class IntesisboxFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):  # type:i
             return self._show_setup_form(user_input, errors)
 
         self._host = user_input[CONF_HOST]
+        self._async_abort_entries_match({CONF_HOST: self._host})
+
+        # Identify the device by its MAC so it can't be added twice by
+        # different hostnames
+        try:
+            controller = await async_acquire_controller(self.hass, self._host)
+        except asyncio.TimeoutError:
+            errors["base"] = "cannot_connect"
+            return self._show_setup_form(user_input, errors)
+        mac = controller.device_mac_address
+        async_release_controller(self.hass, self._host)
 
-        # Check if already configured
-        # await self.async_set_unique_id(self._host)
-        # self._abort_if_unique_id_configured()
+        await self.async_set_unique_id(mac)
+        self._abort_if_unique_id_configured()
 
         return self.async_create_entry(
             title=self._host,
@@ -57,4 +68,7 @@ class IntesisboxFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):  # type:i
 
     async def async_step_import(self, user_input=None):
         """Import a config entry."""
-        return await self.async_step_user(user_input)
+        # The YAML schema has already validated the host
+        host = user_input[CONF_HOST]
+        self._async_abort_entries_match({CONF_HOST: host})
+        return self.async_create_entry(title=host, data={CONF_HOST: host})
@@ -1,9 +1,12 @@
 """Communication with an Intesisbox device."""
 
 import asyncio
-from asyncio import BaseTransport, ensure_future
+from asyncio import BaseTransport
 from collections.abc import Callable
 import logging
+import random
+import re
+import sys
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,33 +36,180 @@ FUNCTION_ERRSTATUS = "ERRSTATUS"
 FUNCTION_ERRCODE = "ERRCODE"
 
 NULL_VALUES = ["-32768", "32768"]
-
-
-class IntesisBox(asyncio.Protocol):
+_NULL_VALUES_SET = frozenset(NULL_VALUES)
+# Values reported in tenths of a degree, converted once when they change
+_TEMPERATURE_FUNCTIONS = frozenset((FUNCTION_SETPOINT, FUNCTION_AMBTEMP))
+
+RECONNECT_MAX_DELAY = 60
+# Up to this many seconds are added to each retry so units don't reconnect
+# in lockstep after a shared outage
+RECONNECT_JITTER = 5
+# Seconds to wait for the TCP connection before treating the attempt as failed
+OPEN_TIMEOUT = 10
+
+# Limits requested on connect, and the queries sent for them in one write
+INITIAL_LIMITS = (
+    FUNCTION_SETPOINT,
+    FUNCTION_FANSP,
+    FUNCTION_MODE,
+    FUNCTION_VANEUD,
+    FUNCTION_VANELR,
+)
+INITIAL_QUERIES = ("ID", *(f"LIMITS:{function}" for function in INITIAL_LIMITS))
+_INITIAL_QUERIES_BYTES = "".join(f"{cmd}\r" for cmd in INITIAL_QUERIES).encode()
+# Seconds to wait for all LIMITS answers, some units don't answer them all
+INITIAL_STATE_TIMEOUT = 5
+
+# SET command for each writable function, with the value as the only
+# placeholder; the setpoint is sent as an integer in tenths of a degree
+_SET_TEMPLATES = {
+    FUNCTION_ONOFF: b"SET,1:ONOFF,%s\r",
+    FUNCTION_MODE: b"SET,1:MODE,%s\r",
+    FUNCTION_SETPOINT: b"SET,1:SETPTEMP,%d\r",
+    FUNCTION_FANSP: b"SET,1:FANSP,%s\r",
+    FUNCTION_VANEUD: b"SET,1:VANEUD,%s\r",
+    FUNCTION_VANELR: b"SET,1:VANELR,%s\r",
+}
+
+# Ready-made frames for the values commonly sent to each enumerated function
+_VANE_VALUES = ("AUTO", "SWING", "1", "2", "3", "4", "5")
+_SET_FRAMES = {
+    (uid, value): _SET_TEMPLATES[uid] % value.encode("ascii")
+    for uid, values in (
+        (FUNCTION_ONOFF, POWER_STATES),
+        (FUNCTION_MODE, MODES),
+        (FUNCTION_FANSP, ("AUTO", "1", "2", "3", "4")),
+        (FUNCTION_VANEUD, _VANE_VALUES),
+        (FUNCTION_VANELR, _VANE_VALUES),
+    )
+    for value in values
+}
+
+# Fixed commands sent periodically, encoded once
+_PING = b"PING\r"
+_GET_STATUS = b"GET,1:*\r"
+
+# One received line, whichever of CR, LF or CRLF the device ends it with
+_LINE = re.compile(rb"[^\r\n]+")
+
+# Receive buffer size; WMP lines are short, so this holds many at once
+RECV_BUFFER_SIZE = 4096
+
+
+class IntesisBox(asyncio.BufferedProtocol):
     """Handles communication with an intesisbox device via WMP."""
 
+    # The asyncio protocol bases define empty __slots__, so this keeps the
+    # instance dict-free
+    __slots__ = (
+        "_connectionStatus",
+        "_connection_retries",
+        "_connection_tasks",
+        "_controllerType",
+        "_device",
+        "_errorCallbacks",
+        "_errorMessage",
+        "_eventLoop",
+        "_fan_speed_list",
+        "_fan_speed_list_title",
+        "_firmversion",
+        "_handlers",
+        "_horizontal_vane_list",
+        "_horizontal_vane_set",
+        "_initial_state_task",
+        "_ip",
+        "_is_on",
+        "_limits_event",
+        "_limits_handlers",
+        "_mac",
+        "_model",
+        "_operation_list",
+        "_pending_limits",
+        "_pending_writes",
+        "_port",
+        "_reconnect_task",
+        "_recv_buffer",
+        "_recv_len",
+        "_recv_view",
+        "_rssi",
+        "_setpoint_maximum",
+        "_setpoint_minimum",
+        "_shutdown",
+        "_state_version",
+        "_temperatures",
+        "_transport",
+        "_transport_write",
+        "_updateCallbacks",
+        "_update_scheduled",
+        "_vertical_vane_list",
+        "_vertical_vane_set",
+        "connected_event",
+    )
+
     def __init__(self, ip: str, port: int = 3310, loop=None):
         """Set up base state."""
         self._ip = ip
         self._port = port
         self._mac = None
         self._device: dict[str, str] = {}
+        self._is_on = False
+        self._temperatures: dict[str, float | None] = {}
         self._connectionStatus = API_DISCONNECTED
         self._transport: BaseTransport | None = None
-        self._updateCallbacks: list[Callable[[], None]] = []
-        self._errorCallbacks: list[Callable[[str], None]] = []
+        self._transport_write: Callable[[bytes], None] | None = None
+        self._pending_writes: list[bytes] = []
+        # asyncio reads straight into this buffer; _recv_len bytes of it
+        # hold a partial line carried over from the previous read
+        self._recv_buffer = bytearray(RECV_BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buffer)
+        self._recv_len = 0
+        # Rebuilt on (un)subscribe, which is rare, so dispatch can iterate
+        # them directly and callbacks may unsubscribe while it runs
+        self._updateCallbacks: tuple[Callable[[], None], ...] = ()
+        self._errorCallbacks: tuple[Callable[[str], None], ...] = ()
+        self._update_scheduled = False
+        # Received line prefix -> handler returning True if listeners need
+        # to be told about a change
+        self._handlers: dict[str, Callable[[str], bool]] = {
+            "ID": self._handle_id,
+            "CHN,1": self._parse_change_received,
+            "LIMITS": self._parse_limits_received,
+        }
+        # LIMITS function -> setter for the values the device reported
+        self._limits_handlers: dict[str, Callable[[list[str]], None]] = {
+            FUNCTION_SETPOINT: self._set_setpoint_limits,
+            FUNCTION_FANSP: self._set_fan_speed_limits,
+            FUNCTION_MODE: self._set_mode_limits,
+            FUNCTION_VANEUD: self._set_vertical_vane_limits,
+            FUNCTION_VANELR: self._set_horizontal_vane_limits,
+        }
         self._errorMessage: str | None = None
         self._controllerType = None
         self._model: str | None = None
         self._firmversion: str | None = None
         self._rssi: int | None = None
         self._eventLoop = loop
+        self.connected_event = asyncio.Event()
+        self._limits_event = asyncio.Event()
+        self._pending_limits: set[str] = set()
+        self._shutdown = False
+        self._connection_retries = 0
+        self._reconnect_task: asyncio.Task | None = None
+        # Tasks that only live as long as one connection
+        self._initial_state_task: asyncio.Task | None = None
+        self._connection_tasks: list[asyncio.Task] = []
+        # Bumped whenever anything observable changes, so clients can skip
+        # copying state that has not moved since they last looked.
+        self._state_version = 0
 
         # Limits
         self._operation_list: list[str] = []
         self._fan_speed_list: list[str] = []
+        self._fan_speed_list_title: tuple[str, ...] = ()
         self._vertical_vane_list: list[str] = []
         self._horizontal_vane_list: list[str] = []
+        self._vertical_vane_set: frozenset[str] = frozenset()
+        self._horizontal_vane_set: frozenset[str] = frozenset()
         self._setpoint_minimum: int | None = None
         self._setpoint_maximum: int | None = None
 
@@ -67,123 +217,264 @@ class IntesisBox(asyncio.Protocol):
         """Asyncio callback for a successful connection."""
         _LOGGER.debug("Connected to IntesisBox")
         self._transport = transport
-        _ = asyncio.ensure_future(self.query_initial_state())
+        # Bound once per connection, every outgoing frame goes through it
+        self._transport_write = transport.write
+        self._recv_len = 0
+        self._cancel_connection_tasks()
+        self._initial_state_task = asyncio.ensure_future(self.query_initial_state())
 
     async def keep_alive(self):
         """Send a keepalive command to reset it's watchdog timer."""
         while self.is_connected:
             _LOGGER.debug("Sending keepalive")
-            self._write("PING")
+            self._write(_PING)
             await asyncio.sleep(45)
         else:
             _LOGGER.debug("Not connected, skipping keepalive")
 
     async def query_initial_state(self):
-        """Fetch configuration from the device upon connection."""
-        cmds = [
-            "ID",
-            "LIMITS:SETPTEMP",
-            "LIMITS:FANSP",
-            "LIMITS:MODE",
-            "LIMITS:VANEUD",
-            "LIMITS:VANELR",
-        ]
-        for cmd in cmds:
-            self._write(cmd)
-            await asyncio.sleep(1)
-
-    def _write(self, cmd):
-        self._transport.write(f"{cmd}\r".encode("ascii"))
-        _LOGGER.debug(f"Data sent: {cmd!r}")
-
-    def data_received(self, data):
-        """Asyncio callback when data is received on the socket."""
-        linesReceived = data.decode("ascii").splitlines()
+        """Fetch configuration from the device upon connection.
+
+        connected_event is only set once the limits have arrived (or stopped
+        arriving), so clients waiting on it see the full device description.
+        """
+        self._pending_limits = set(INITIAL_LIMITS)
+        self._limits_event.clear()
+        self._write(_INITIAL_QUERIES_BYTES)
+        try:
+            await asyncio.wait_for(self._limits_event.wait(), INITIAL_STATE_TIMEOUT)
+        except asyncio.TimeoutError:
+            _LOGGER.debug("No LIMITS received for %s", self._pending_limits)
+            self._pending_limits.clear()
+        if self.is_connected:
+            self.connected_event.set()
+
+    def _write(self, data: bytes):
+        # Every command is pre-encoded with its terminating CR. Commands
+        # issued in the same loop iteration go out together in one write.
+        self._pending_writes.append(data)
+        if len(self._pending_writes) == 1:
+            self._eventLoop.call_soon(self._flush_writes)
+
+    def _flush_writes(self):
+        """Send every command queued since the last flush in one write."""
+        data = b"".join(self._pending_writes)
+        self._pending_writes.clear()
+        if self._transport_write is None:
+            _LOGGER.debug("Not connected, dropping %r", data)
+            return
+        self._transport_write(data)
+        _LOGGER.debug("Data sent: %r", data)
+
+    def get_buffer(self, sizehint):
+        """Asyncio callback for the buffer to read the socket into."""
+        if self._recv_len == RECV_BUFFER_SIZE:
+            # No WMP line is this long, so drop it rather than grow forever
+            _LOGGER.debug("Discarding %s bytes without a line end", self._recv_len)
+            self._recv_len = 0
+        return self._recv_view[self._recv_len :]
+
+    def buffer_updated(self, nbytes):
+        """Asyncio callback when data has been read into the buffer."""
+        buf = self._recv_buffer
+        view = self._recv_view
+        end = self._recv_len + nbytes
+        # Only parse up to the last line end; the rest waits for more data
+        last = max(buf.rfind(b"\r", 0, end), buf.rfind(b"\n", 0, end))
+        if last < 0:
+            self._recv_len = end
+            return
+
+        # Resolve these once per read rather than once per line
+        get_handler = self._handlers.get
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
         statusChanged = False
-
-        for line in linesReceived:
-            _LOGGER.debug(f"Data received: {line!r}")
-            cmdList = line.split(":", 1)
-            cmd = cmdList[0]
-            args = None
-            if len(cmdList) > 1:
-                args = cmdList[1]
-                if cmd == "ID":
-                    self._parse_id_received(args)
-                    self._connectionStatus = API_AUTHENTICATED
-                    _ = asyncio.ensure_future(self.keep_alive())
-                    _ = asyncio.ensure_future(self.poll_status())
-                elif cmd == "CHN,1":
-                    self._parse_change_received(args)
-                    statusChanged = True
-                elif cmd == "LIMITS":
-                    self._parse_limits_received(args)
+        # Decode each line straight out of the buffer, without a list of copies
+        for match in _LINE.finditer(buf, 0, last):
+            line = str(view[match.start() : match.end()], "ascii")
+            if debug:
+                _LOGGER.debug("Data received: %r", line)
+            cmd, sep, args = line.partition(":")
+            if sep:
+                handler = get_handler(cmd)
+                if handler and handler(args):
                     statusChanged = True
 
-        if statusChanged:
-            self._send_update_callback()
+        remaining = end - last - 1
+        view[:remaining] = view[last + 1 : end]
+        self._recv_len = remaining
+
+        # Reads completing in the same loop iteration share one notification
+        if statusChanged and not self._update_scheduled:
+            self._update_scheduled = True
+            self._eventLoop.call_soon(self._flush_update_callback)
+
+    def _flush_update_callback(self):
+        """Notify listeners once for every change received since scheduling."""
+        self._update_scheduled = False
+        self._send_update_callback()
+
+    def _handle_id(self, args) -> bool:
+        """Complete the handshake once the device has identified itself."""
+        self._parse_id_received(args)
+        self._connectionStatus = API_AUTHENTICATED
+        self._connection_retries = 0
+        self._state_version += 1
+        if not self._pending_limits:
+            self.connected_event.set()
+        # A repeated ID on the same connection must not start a second set
+        if not self._connection_tasks:
+            self._connection_tasks = [
+                asyncio.ensure_future(self.keep_alive()),
+                asyncio.ensure_future(self.poll_status()),
+            ]
+        # The connection state changed even if no value did
+        return True
 
     def _parse_id_received(self, args):
         # ID:Model,MAC,IP,Protocol,Version,RSSI
-        info = args.split(",")
-        if len(info) >= 6:
-            self._model = info[0]
-            self._mac = info[1]
-            self._firmversion = info[4]
-            self._rssi = info[5]
+        try:
+            model, mac, _ip, _protocol, version, rssi, *_ = args.split(",")
+        except ValueError:
+            return
+        self._model = model
+        self._mac = mac
+        self._firmversion = version
+        self._rssi = rssi
+
+        _LOGGER.debug(
+            "Updated info: model:%s mac:%s version:%s rssi:%s",
+            model,
+            mac,
+            version,
+            rssi,
+        )
+
+    def _parse_change_received(self, args) -> bool:
+        # Intern so lookups against the module's literal keys compare by identity
+        function, _, value = args.partition(",")
+        function = sys.intern(function)
+        if value in _NULL_VALUES_SET:
+            value = None
+        else:
+            value = sys.intern(value)
+        changed = self._device.get(function) != value
+        if changed:
+            self._state_version += 1
+            if function == FUNCTION_ONOFF:
+                self._is_on = value == POWER_ON
+            if function in _TEMPERATURE_FUNCTIONS:
+                self._temperatures[function] = self._parse_temperature(value)
+        self._device[function] = value
+
+        _LOGGER.debug("Updated state: %r", self._device)
+        return changed
+
+    @staticmethod
+    def _parse_temperature(value: str | None) -> float | None:
+        """Convert a value in tenths of a degree to degrees."""
+        if not value:
+            return None
+        try:
+            return int(value) / 10
+        except ValueError:
+            _LOGGER.debug("Ignoring invalid temperature %r", value)
+            return None
+
+    def _parse_limits_received(self, args) -> bool:
+        function, sep, rest = args.partition(",")
+
+        if sep:
+            self._state_version += 1
+            values = rest[1:-1].split(",")
+            if self._pending_limits:
+                self._pending_limits.discard(function)
+                if not self._pending_limits:
+                    self._limits_event.set()
+
+            handler = self._limits_handlers.get(function)
+            if handler:
+                handler(values)
 
             _LOGGER.debug(
-                "Updated info:",
-                f"model:{self._model}",
-                f"mac:{self._mac}",
-                f"version:{self._firmversion}",
-                f"rssi:{self._rssi}",
+                "Updated limits: setpoint_minimum=%s setpoint_maximum=%s "
+                "fan_speed_list=%r operation_list=%r vertical_vane_list=%r "
+                "horizontal_vane_list=%r",
+                self._setpoint_minimum,
+                self._setpoint_maximum,
+                self._fan_speed_list,
+                self._operation_list,
+                self._vertical_vane_list,
+                self._horizontal_vane_list,
             )
+        return True
 
-    def _parse_change_received(self, args):
-        function = args.split(",")[0]
-        value = args.split(",")[1]
-        if value in NULL_VALUES:
-            value = None
-        self._device[function] = value
-
-        _LOGGER.debug(f"Updated state: {self._device!r}")
+    def _set_setpoint_limits(self, values: list[str]):
+        if len(values) == 2:
+            self._setpoint_minimum = int(values[0]) / 10
+            self._setpoint_maximum = int(values[1]) / 10
 
-    def _parse_limits_received(self, args):
-        split_args = args.split(",", 1)
+    def _set_fan_speed_limits(self, values: list[str]):
+        self._fan_speed_list = values
+        self._fan_speed_list_title = tuple(
+            sys.intern(value.title()) for value in values
+        )
 
-        if len(split_args) == 2:
-            function = split_args[0]
-            values = split_args[1][1:-1].split(",")
+    def _set_mode_limits(self, values: list[str]):
+        self._operation_list = values
 
-            if function == FUNCTION_SETPOINT and len(values) == 2:
-                self._setpoint_minimum = int(values[0]) / 10
-                self._setpoint_maximum = int(values[1]) / 10
-            elif function == FUNCTION_FANSP:
-                self._fan_speed_list = values
-            elif function == FUNCTION_MODE:
-                self._operation_list = values
-            elif function == FUNCTION_VANEUD:
-                self._vertical_vane_list = values
-            elif function == FUNCTION_VANELR:
-                self._horizontal_vane_list = values
+    def _set_vertical_vane_limits(self, values: list[str]):
+        self._vertical_vane_list = values
+        self._vertical_vane_set = frozenset(values)
 
-            _LOGGER.debug(
-                "Updated limits: ",
-                f"{self._setpoint_minimum=}",
-                f"{self._setpoint_maximum=}",
-                f"{self._fan_speed_list=}",
-                f"{self._operation_list=}",
-                f"{self._vertical_vane_list=}",
-                f"{self._horizontal_vane_list=}",
-            )
-        return
+    def _set_horizontal_vane_limits(self, values: list[str]):
+        self._horizontal_vane_list = values
+        self._horizontal_vane_set = frozenset(values)
 
     def connection_lost(self, exc):
         """Asyncio callback for a lost TCP connection."""
         self._connectionStatus = API_DISCONNECTED
+        # Writes are flushed later, so they must not reach the closed transport
+        self._transport_write = None
+        self._state_version += 1
+        self.connected_event.clear()
+        self._cancel_connection_tasks()
         _LOGGER.info("The server closed the connection")
         self._send_update_callback()
+        if not self._shutdown and self._reconnect_task is None:
+            self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self):
+        """Reconnect with exponential backoff until the connection is restored."""
+        try:
+            while not self._shutdown:
+                delay = min(1 << min(self._connection_retries, 16), RECONNECT_MAX_DELAY)
+                delay += random.uniform(0, RECONNECT_JITTER)
+                _LOGGER.debug("Reconnecting to IntesisBox in %.1f seconds", delay)
+                await asyncio.sleep(delay)
+                self._connection_retries += 1
+                self._state_version += 1
+                self._send_update_callback()
+                self._connectionStatus = API_CONNECTING
+                if await self._open_connection():
+                    return
+        finally:
+            self._reconnect_task = None
+
+    async def _open_connection(self) -> bool:
+        """Open the TCP connection, returning False if it could not be made."""
+        try:
+            await asyncio.wait_for(
+                self._eventLoop.create_connection(lambda: self, self._ip, self._port),
+                OPEN_TIMEOUT,
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            _LOGGER.debug(
+                "Unable to connect to IntesisBox %s:%s: %s", self._ip, self._port, e
+            )
+            self._connectionStatus = API_DISCONNECTED
+            return False
+        return True
 
     def connect(self):
         """Public method for connecting to IntesisHome API."""
@@ -193,13 +484,13 @@ class IntesisBox(asyncio.Protocol):
                 # Must poll to get the authentication token
                 if self._ip and self._port:
                     # Create asyncio socket
-                    coro = self._eventLoop.create_connection(
-                        lambda: self, self._ip, self._port
-                    )
+                    self._shutdown = False
                     _LOGGER.debug(
                         "Opening connection to IntesisBox %s:%s", self._ip, self._port
                     )
-                    _ = ensure_future(coro, loop=self._eventLoop)
+                    _ = asyncio.ensure_future(
+                        self._open_connection(), loop=self._eventLoop
+                    )
                 else:
                     _LOGGER.debug("Missing IP address or port.")
                     self._connectionStatus = API_DISCONNECTED
@@ -212,14 +503,29 @@ class IntesisBox(asyncio.Protocol):
 
     def stop(self):
         """Public method for shutting down connectivity with the envisalink."""
+        self._shutdown = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        self._cancel_connection_tasks()
         self._connectionStatus = API_DISCONNECTED
-        self._transport.close()
+        self.connected_event.clear()
+        if self._transport:
+            self._transport.close()
+
+    def _cancel_connection_tasks(self):
+        """Stop the handshake, keepalive and polling of the current connection."""
+        if self._initial_state_task:
+            self._initial_state_task.cancel()
+            self._initial_state_task = None
+        for task in self._connection_tasks:
+            task.cancel()
+        self._connection_tasks = []
 
     async def poll_status(self, sendcallback=False):
         """Periodically poll for updates since the controllers don't always update reliably."""
         while self.is_connected:
             _LOGGER.debug("Polling for update")
-            self._write("GET,1:*")
+            self._write(_GET_STATUS)
             await asyncio.sleep(60 * 5)  # 5 minutes
         else:
             _LOGGER.debug("Not connected, skipping poll_status()")
@@ -241,24 +547,51 @@ class IntesisBox(asyncio.Protocol):
         """Public method to set the horizontal vane."""
         self._set_value(FUNCTION_VANELR, vane)
 
+    def set_vanes(self, vertical: str, horizontal: str) -> None:
+        """Public method to set both vanes in a single write."""
+        self._set_values((FUNCTION_VANEUD, vertical), (FUNCTION_VANELR, horizontal))
+
+    @staticmethod
+    def _encode_set(uid: str, value: str | int) -> bytes:
+        """Build the SET command for a setting, ready to write."""
+        frame = _SET_FRAMES.get((uid, value))
+        if frame is not None:
+            return frame
+        if isinstance(value, str):
+            value = value.encode("ascii")
+        return _SET_TEMPLATES[uid] % (value,)
+
+    def _set_values(self, *values: tuple[str, str | int]) -> None:
+        """Change several settings on the thermostat in one write."""
+        try:
+            self._write(b"".join(self._encode_set(uid, value) for uid, value in values))
+        except Exception as e:
+            _LOGGER.error("%s Exception. %s / %s", type(e), e.args, e)
+
     def _set_value(self, uid: str, value: str | int) -> None:
         """Change a setting on the thermostat."""
         try:
-            self._write(f"SET,1:{uid},{value}")
+            self._write(self._encode_set(uid, value))
         except Exception as e:
             _LOGGER.error("%s Exception. %s / %s", type(e), e.args, e)
 
-    def set_mode(self, mode: str) -> None:
-        """Change the thermostat mode (heat, cool, etc)."""
+    def set_mode(self, mode: str, setpoint: float | None = None) -> None:
+        """Change the thermostat mode (heat, cool, etc), optionally with a setpoint."""
+        values: list[tuple[str, str | int]] = []
         if not self.is_on:
-            self.set_power_on()
+            values.append((FUNCTION_ONOFF, POWER_ON))
 
         if mode in MODES:
-            self._set_value(FUNCTION_MODE, mode)
+            values.append((FUNCTION_MODE, mode))
+            if setpoint:
+                values.append((FUNCTION_SETPOINT, int(setpoint * 10)))
+
+        if values:
+            self._set_values(*values)
 
     def set_mode_dry(self):
         """Public method to set device to dry asynchronously."""
-        self._set_value(FUNCTION_MODE, MODE_DRY)
+        self.set_mode(MODE_DRY)
 
     def set_power_off(self):
         """Public method to turn off the device asynchronously."""
@@ -283,6 +616,16 @@ class IntesisBox(asyncio.Protocol):
         """Supported Vertical Vane settings."""
         return self._vertical_vane_list
 
+    @property
+    def vane_horizontal_set(self) -> frozenset[str]:
+        """Supported Horizontal Vane settings, for membership tests."""
+        return self._horizontal_vane_set
+
+    @property
+    def vane_vertical_set(self) -> frozenset[str]:
+        """Supported Vertical Vane settings, for membership tests."""
+        return self._vertical_vane_set
+
     @property
     def mode(self) -> str | None:
         """Current mode."""
@@ -298,6 +641,11 @@ class IntesisBox(asyncio.Protocol):
         """Supported fan speeds."""
         return self._fan_speed_list
 
+    @property
+    def fan_speed_list_title(self) -> tuple[str, ...]:
+        """Supported fan speeds in title case, as shown to users."""
+        return self._fan_speed_list_title
+
     @property
     def device_mac_address(self) -> str | None:
         """MAC address of the IntesisBox."""
@@ -316,7 +664,7 @@ class IntesisBox(asyncio.Protocol):
     @property
     def is_on(self) -> bool:
         """Return true if the controlled device is turned on."""
-        return self._device.get(FUNCTION_ONOFF) == POWER_ON
+        return self._is_on
 
     @property
     def has_swing_control(self) -> bool:
@@ -326,14 +674,12 @@ class IntesisBox(asyncio.Protocol):
     @property
     def setpoint(self) -> float | None:
         """Public method returns the target temperature."""
-        setpoint = self._device.get(FUNCTION_SETPOINT)
-        return (int(setpoint) / 10) if setpoint else None
+        return self._temperatures.get(FUNCTION_SETPOINT)
 
     @property
     def ambient_temperature(self) -> float | None:
         """Public method returns the current temperature."""
-        temperature = self._device.get(FUNCTION_AMBTEMP)
-        return (int(temperature) / 10) if temperature else None
+        return self._temperatures.get(FUNCTION_AMBTEMP)
 
     @property
     def max_setpoint(self) -> float | None:
@@ -362,9 +708,6 @@ class IntesisBox(asyncio.Protocol):
 
     def _send_update_callback(self):
         """Notify all listeners that state of the thermostat has changed."""
-        if not self._updateCallbacks:
-            _LOGGER.debug("Update callback has not been set by client.")
-
         for callback in self._updateCallbacks:
             callback()
 
@@ -372,9 +715,6 @@ class IntesisBox(asyncio.Protocol):
         """Notify all listeners that an error has occurred."""
         self._errorMessage = message
 
-        if self._errorCallbacks == []:
-            _LOGGER.debug("Error callback has not been set by client.")
-
         for callback in self._errorCallbacks:
             callback(message)
 
@@ -383,6 +723,16 @@ class IntesisBox(asyncio.Protocol):
         """Returns true if the TCP connection is established."""
         return self._connectionStatus == API_AUTHENTICATED
 
+    @property
+    def state_version(self) -> int:
+        """Counter that increases whenever the device state or limits change."""
+        return self._state_version
+
+    @property
+    def connection_retries(self) -> int:
+        """Number of reconnection attempts since the connection was lost."""
+        return self._connection_retries
+
     @property
     def error_message(self) -> str | None:
         """Returns the last error message, or None if there were no errors."""
@@ -395,8 +745,22 @@ class IntesisBox(asyncio.Protocol):
 
     def add_update_callback(self, method):
         """Public method to add a callback subscriber."""
-        self._updateCallbacks.append(method)
+        if method not in self._updateCallbacks:
+            self._updateCallbacks = (*self._updateCallbacks, method)
+
+    def remove_update_callback(self, method):
+        """Public method to remove a callback subscriber."""
+        self._updateCallbacks = tuple(
+            callback for callback in self._updateCallbacks if callback != method
+        )
 
     def add_error_callback(self, method):
         """Public method to add a callback subscriber."""
-        self._errorCallbacks.append(method)
+        if method not in self._errorCallbacks:
+            self._errorCallbacks = (*self._errorCallbacks, method)
+
+    def remove_error_callback(self, method):
+        """Public method to remove a callback subscriber."""
+        self._errorCallbacks = tuple(
+            callback for callback in self._errorCallbacks if callback != method
+        )